@@ -56,13 +56,34 @@ from .repoproviders import (GitHubRepoProvider, GitRepoProvider,
                             DataverseProvider)
 from .metrics import MetricsHandler
 
-from .utils import ByteSpecification, url_path_join
+from .utils import ByteSpecification, orjson, url_path_join
 from .events import EventLog
 
 
 HERE = os.path.dirname(os.path.abspath(__file__))
 
 
+def _jinja_json_dumps(obj, **kwargs):
+    """orjson-based json.dumps_function policy for jinja's tojson filter
+
+    Falls back on json.dumps for arguments orjson doesn't support
+    and for objects it can't serialize, such as integers over 64 bits.
+    """
+    option = orjson.OPT_NON_STR_KEYS
+    orjson_kwargs = dict(kwargs)
+    if orjson_kwargs.pop("sort_keys", False):
+        option |= orjson.OPT_SORT_KEYS
+    if orjson_kwargs.get("indent") == 2:
+        orjson_kwargs.pop("indent")
+        option |= orjson.OPT_INDENT_2
+    if not orjson_kwargs:
+        try:
+            return orjson.dumps(obj, option=option).decode("utf8")
+        except TypeError:
+            pass
+    return json.dumps(obj, **kwargs)
+
+
 class BinderHub(Application):
     """An Application for starting a builder."""
 
@@ -629,6 +650,17 @@ class BinderHub(Application):
     def _template_path_default(self):
         return os.path.join(HERE, 'templates')
 
+    template_auto_reload = Bool(
+        True,
+        help="""
+        Check templates on disk for changes before using them.
+
+        Set to False to use templates compiled once at startup,
+        if custom templates are not updated while BinderHub is running.
+        """,
+        config=True,
+    )
+
     extra_static_path = Unicode(
         help='Path to search for extra static files.',
         config=True,
@@ -694,7 +726,7 @@ class BinderHub(Application):
         # this should not be used for long-running requests
         self.executor = ThreadPoolExecutor(self.executor_threads)
 
-        jinja_options = dict(autoescape=True, )
+        jinja_options = dict(autoescape=True, auto_reload=self.template_auto_reload)
         template_paths = [self.template_path]
         base_template_path = self._template_path_default()
         if base_template_path not in template_paths:
@@ -707,6 +739,8 @@ class BinderHub(Application):
             FileSystemLoader(template_paths)
         ])
         jinja_env = Environment(loader=loader, **jinja_options)
+        if orjson is not None:
+            jinja_env.policies['json.dumps_function'] = _jinja_json_dumps
         if self.use_registry and self.builder_required:
             registry = DockerRegistry(parent=self)
         else:
@@ -774,6 +808,17 @@ class BinderHub(Application):
                 "normalized_origin": self.normalized_origin,
             }
         )
+        # per-request values that don't change, computed once
+        self.tornado_settings["default_headers"] = tuple(
+            self.tornado_settings.get("headers", {}).items()
+        ) + (("access-control-allow-headers", "cache-control"),)
+        self.tornado_settings["static_template_namespace"] = dict(
+            banner=self.banner_message,
+            **self.template_variables
+        )
+        # error pages that are the same for every request,
+        # by status code, filled in as they are first rendered
+        self.tornado_settings["rendered_error_pages"] = {}
         if self.auth_enabled:
             self.tornado_settings['cookie_secret'] = os.urandom(32)
 
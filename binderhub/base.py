@@ -1,6 +1,5 @@
 """Base classes for request handlers"""
 
-import json
 import urllib.parse
 
 import jwt
@@ -11,16 +10,29 @@ from jupyterhub.services.auth import HubOAuthenticated, HubOAuth
 
 from . import __version__ as binder_version
 from .ratelimit import RateLimitExceeded
-from .utils import ip_in_networks
+from .utils import ip_in_networks, json_dumps
+
+
+def _get_anonymous_user():
+    return 'anonymous'
 
 
 class BaseHandler(HubOAuthenticated, web.RequestHandler):
     """HubAuthenticated by default allows all successfully identified users (see allow_all property)."""
 
+    # the HubOAuth singleton, shared by all handlers
+    _shared_hub_oauth = None
+
     def initialize(self):
         super().initialize()
         if self.settings['auth_enabled']:
-            self.hub_auth = HubOAuth.instance(config=self.settings['traitlets_config'])
+            if BaseHandler._shared_hub_oauth is None:
+                BaseHandler._shared_hub_oauth = HubOAuth.instance(config=self.settings['traitlets_config'])
+            self.hub_auth = BaseHandler._shared_hub_oauth
+        else:
+            # skip the auth_enabled check and HubOAuthenticated lookup
+            # in get_current_user when auth is disabled
+            self.get_current_user = _get_anonymous_user
 
     def prepare(self):
         super().prepare()
@@ -138,32 +150,28 @@ class BaseHandler(HubOAuthenticated, web.RequestHandler):
     @property
     def template_namespace(self):
         return dict(static_url=self.static_url,
-                    banner=self.settings['banner_message'],
-                    **self.settings.get('template_variables', {}))
+                    **self.settings['static_template_namespace'])
 
     def set_default_headers(self):
-        headers = self.settings.get('headers', {})
-        for header, value in headers.items():
+        for header, value in self.settings['default_headers']:
             self.set_header(header, value)
-        self.set_header("access-control-allow-headers", "cache-control")
 
     def get_spec_from_request(self, prefix):
         """Re-extract spec from request.path.
         Get the original, raw spec, without tornado's unquoting.
         This is needed because tornado converts 'foo%2Fbar/ref' to 'foo/bar/ref'.
         """
-        idx = self.request.path.index(prefix)
-        spec = self.request.path[idx + len(prefix) + 1:]
-        return spec
+        _, sep, spec = self.request.path.partition(prefix + '/')
+        return spec if sep else ''
 
     def get_provider(self, provider_prefix, spec):
         """Construct a provider object"""
-        providers = self.settings['repo_providers']
-        if provider_prefix not in providers:
+        try:
+            provider_class = self.settings['repo_providers'][provider_prefix]
+        except KeyError:
             raise web.HTTPError(404, "No provider found for prefix %s" % provider_prefix)
 
-        return providers[provider_prefix](
-            config=self.settings['traitlets_config'], spec=spec)
+        return provider_class(config=self.settings['traitlets_config'], spec=spec)
 
     def get_badge_base_url(self):
         badge_base_url = self.settings['badge_base_url']
@@ -171,23 +179,30 @@ class BaseHandler(HubOAuthenticated, web.RequestHandler):
             badge_base_url = badge_base_url(self)
         return badge_base_url
 
-    def render_template(self, name, **extra_ns):
-        """Render an HTML page"""
+    def render_template_html(self, name, **extra_ns):
+        """Render an HTML page, returning the html"""
         ns = {}
         ns.update(self.template_namespace)
         ns.update(extra_ns)
         template = self.settings['jinja2_env'].get_template(name)
-        html = template.render(**ns)
-        self.write(html)
+        return template.render(**ns)
+
+    def render_template(self, name, **extra_ns):
+        """Render an HTML page"""
+        self.write(self.render_template_html(name, **extra_ns))
 
     def extract_message(self, exc_info):
         """Return error message from exc_info"""
         exception = exc_info[1]
         # get the custom message, if defined
-        try:
-            return exception.log_message % exception.args
-        except Exception:
+        log_message = getattr(exception, 'log_message', None)
+        if not log_message:
             return ''
+        try:
+            return log_message % exception.args
+        except (TypeError, ValueError):
+            # not a format string for these args
+            return log_message
 
     def write_error(self, status_code, **kwargs):
         exc_info = kwargs.get('exc_info')
@@ -208,10 +223,25 @@ class BaseHandler(HubOAuthenticated, web.RequestHandler):
 
 
 class Custom404(BaseHandler):
-    """Raise a 404 error, rendering the error.html template"""
+    """Respond with a 404 error, rendering the error.html template"""
 
     def prepare(self):
-        raise web.HTTPError(404)
+        # the 404 page is the same for every request,
+        # so only render it once unless templates may change
+        cache = not self.settings['jinja2_env'].auto_reload
+        rendered_pages = self.settings['rendered_error_pages']
+        html = rendered_pages.get(404) if cache else None
+        if html is None:
+            html = self.render_template_html(
+                'error.html',
+                status_code=404,
+                status_message=responses[404],
+                message='',
+            )
+            if cache:
+                rendered_pages[404] = html
+        self.set_status(404)
+        self.finish(html)
 
 
 class AboutHandler(BaseHandler):
@@ -240,7 +270,7 @@ class VersionHandler(BaseHandler):
 
     async def get(self):
         self.set_header("Content-type", "application/json")
-        self.write(json.dumps(
+        self.write(json_dumps(
             {
                 "builder": self.settings['build_image'],
                 "binderhub": binder_version,
@@ -12,7 +12,7 @@ from kubernetes import client, watch
 from tornado.ioloop import IOLoop
 from tornado.log import app_log
 
-from .utils import rendezvous_rank, KUBE_REQUEST_TIMEOUT
+from .utils import json_dumps, rendezvous_rank, KUBE_REQUEST_TIMEOUT
 
 
 class Build:
@@ -434,8 +434,9 @@ class Build:
             if self.stop_event.is_set():
                 app_log.info("Stopping logs of %s", self.name)
                 return
-            # verify that the line is JSON
-            line = line.decode('utf-8')
+            # verify that the line is JSON.
+            # Valid lines are passed on as bytes, ready to be sent
+            # to the event stream without re-encoding.
             try:
                 json.loads(line)
             except ValueError:
@@ -444,8 +445,9 @@ class Build:
                 # We don't know what the right phase is, use 'unknown'.
                 # If it was a fatal error, presumably a 'failure'
                 # message will arrive shortly.
+                line = line.decode('utf-8', 'replace')
                 app_log.error("log event not json: %r", line)
-                line = json.dumps({
+                line = json_dumps({
                     'phase': 'unknown',
                     'message': line,
                 })
@@ -494,7 +496,7 @@ class FakeBuild(Build):
                 app_log.warning("Stopping logs of %s", self.name)
                 return
             self.progress('log',
-                json.dumps({
+                json_dumps({
                     'phase': phase,
                     'message': f"{phase}...\n",
                 })
@@ -505,13 +507,13 @@ class FakeBuild(Build):
                 return
             time.sleep(1)
             self.progress('log',
-                json.dumps({
+                json_dumps({
                     'phase': 'unknown',
                     'message': f"Step {i+1}/10\n",
                 })
             )
         self.progress('pod.phasechange', 'Succeeded')
-        self.progress('log', json.dumps({
+        self.progress('log', json_dumps({
                 'phase': 'Deleted',
                 'message': f"Deleted...\n",
              })
@@ -23,7 +23,7 @@ from prometheus_client import Counter, Histogram, Gauge
 
 from .base import BaseHandler
 from .build import Build, FakeBuild
-from .utils import KUBE_REQUEST_TIMEOUT
+from .utils import KUBE_REQUEST_TIMEOUT, json_dumps
 
 # Separate buckets for builds and launches.
 # Builds and launches have very different characteristic times,
@@ -55,6 +55,29 @@ LAUNCH_COUNT = Counter(
 BUILDS_INPROGRESS = Gauge('binderhub_inprogress_builds', 'Builds currently in progress')
 LAUNCHES_INPROGRESS = Gauge('binderhub_inprogress_launches', 'Launches currently in progress')
 
+# pre-encoded event stream framing
+_SSE_PREFIX = b"data: "
+_SSE_SUFFIX = b"\n\n"
+# lines that start with : are comments
+# and should be ignored by event consumers
+_KEEPALIVE_FRAME = b":keepalive\n\n"
+
+
+def _error_frame(status_code, message=''):
+    """Serialize a failed event for the event stream"""
+    if not message:
+        message = responses.get(status_code, 'Unknown HTTP Error')
+    evt = json_dumps({
+        'phase': 'failed',
+        'status_code': status_code,
+        'message': message + '\n',
+    })
+    return _SSE_PREFIX + evt + _SSE_SUFFIX
+
+
+# failed events for common errors without a custom message
+_ERROR_FRAMES = {code: _error_frame(code) for code in (404, 500, 502, 503)}
+
 
 def _get_image_basename_and_tag(full_name):
     """Get a supposed image name and tag without the registry part
@@ -141,45 +164,93 @@ class BuildHandler(BaseHandler):
     # emit keepalives every 25 seconds to avoid idle connections being closed
     KEEPALIVE_INTERVAL = 25
     build = None
+    _keepalive_handle = None
+    _flush_scheduled = False
+    _flush_future = None
+    _stream_closed = False
 
     async def emit(self, data):
-        """Emit an eventstream event"""
-        if type(data) is not str:
-            serialized_data = json.dumps(data)
-        else:
+        """Emit an eventstream event
+
+        Events written while no flush is in progress are coalesced
+        and sent with a single flush in the next iteration of the event loop.
+        If a flush is in progress, wait for it first,
+        so that slow clients apply backpressure to the build.
+        """
+        if isinstance(data, (bytes, bytearray)):
+            # already serialized
             serialized_data = data
-        try:
-            self.write('data: {}\n\n'.format(serialized_data))
-            await self.flush()
-        except StreamClosedError:
+        elif isinstance(data, str):
+            serialized_data = data.encode("utf8")
+        else:
+            serialized_data = json_dumps(data)
+        if self._flush_future is not None:
+            try:
+                await self._flush_future
+            except StreamClosedError:
+                self._stream_closed = True
+        if self._stream_closed:
             app_log.warning("Stream closed while handling %s", self.request.uri)
             # raise Finish to halt the handler
             raise Finish()
+        self.write(_SSE_PREFIX + serialized_data + _SSE_SUFFIX)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            IOLoop.current().add_callback(self._flush_events)
+
+    async def _flush_events(self):
+        """Flush the events written by emit since the last flush"""
+        self._flush_scheduled = False
+        if self._finished:
+            return
+        await self._flush()
+
+    async def _flush(self):
+        """Flush, keeping the future on the handler while it is in progress
+
+        Only one flush should be in progress at a time:
+        tornado only resolves the future of the most recent write.
+        """
+        self._flush_future = self.flush()
+        try:
+            await self._flush_future
+        except StreamClosedError:
+            self._stream_closed = True
+        finally:
+            self._flush_future = None
 
     def on_finish(self):
         """Stop keepalive when finish has been called"""
-        self._keepalive = False
+        if self._keepalive_handle is not None:
+            IOLoop.current().remove_timeout(self._keepalive_handle)
+            self._keepalive_handle = None
         if self.build:
             # if we have a build, tell it to stop watching
             self.build.stop()
 
-    async def keep_alive(self):
-        """Constantly emit keepalive events
+    def keep_alive(self):
+        """Schedule the next keepalive event
 
         So that intermediate proxies don't terminate an idle connection
         """
-        self._keepalive = True
-        while True:
-            await gen.sleep(self.KEEPALIVE_INTERVAL)
-            if not self._keepalive:
-                return
-            try:
-                # lines that start with : are comments
-                # and should be ignored by event consumers
-                self.write(':keepalive\n\n')
-                await self.flush()
-            except StreamClosedError:
+        self._keepalive_handle = IOLoop.current().call_later(
+            self.KEEPALIVE_INTERVAL, self._send_keepalive
+        )
+
+    async def _send_keepalive(self):
+        """Emit a keepalive event and schedule the next one"""
+        self._keepalive_handle = None
+        if self._finished:
+            return
+        # skip the keepalive if events are being sent,
+        # the connection isn't idle
+        if not (self._flush_scheduled or self._flush_future is not None):
+            self.write(_KEEPALIVE_FRAME)
+            await self._flush()
+            if self._stream_closed:
                 return
+        if not self._finished:
+            self.keep_alive()
 
     def send_error(self, status_code, **kwargs):
         """event stream cannot set an error code, so send an error event"""
@@ -187,16 +258,11 @@ class BuildHandler(BaseHandler):
         message = ''
         if exc_info:
             message = self.extract_message(exc_info)
-        if not message:
-            message = responses.get(status_code, 'Unknown HTTP Error')
-
         # this cannot be async
-        evt = json.dumps({
-            'phase': 'failed',
-            'status_code': status_code,
-            'message': message + '\n',
-        })
-        self.write('data: {}\n\n'.format(evt))
+        if not message and status_code in _ERROR_FRAMES:
+            self.write(_ERROR_FRAMES[status_code])
+        else:
+            self.write(_error_frame(status_code, message))
         self.finish()
 
     def initialize(self):
@@ -252,7 +318,7 @@ class BuildHandler(BaseHandler):
             return
 
         # create a heartbeat
-        IOLoop.current().spawn_callback(self.keep_alive)
+        self.keep_alive()
 
         spec = spec.rstrip("/")
         key = '%s:%s' % (provider_prefix, spec)
@@ -468,7 +534,8 @@ class BuildHandler(BaseHandler):
                         # FIXME: message? debug?
                         event = {'phase': progress['payload']}
                 elif progress['kind'] == 'log':
-                    # We expect logs to be already JSON structured anyway
+                    # We expect logs to be already JSON structured anyway,
+                    # and serialized to bytes
                     event = progress['payload']
                     payload = json.loads(event)
                     if payload.get('phase') in ('failure', 'failed'):
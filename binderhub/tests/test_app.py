@@ -1,11 +1,14 @@
 """Exercise the binderhub entrypoint"""
 
+import json
 from subprocess import check_output
 import sys
 import pytest
 
+from jinja2 import Environment
 from traitlets import TraitError
 
+from binderhub import app as app_module
 from binderhub.app import BinderHub
 from binderhub.repoproviders import (RepoProvider, GitLabRepoProvider, GitHubRepoProvider)
 
@@ -36,3 +39,36 @@ def test_repo_providers():
     for repo_providers in wrong_repo_providers:
         with pytest.raises(TraitError):
             b.repo_providers = repo_providers
+
+
+@pytest.mark.parametrize("template_auto_reload", [True, False])
+def test_template_auto_reload(template_auto_reload):
+    b = BinderHub(template_auto_reload=template_auto_reload, builder_required=False)
+    b.initialize([])
+    assert b.tornado_settings["jinja2_env"].auto_reload is template_auto_reload
+
+
+@pytest.mark.skipif(app_module.orjson is None, reason="orjson not installed")
+@pytest.mark.parametrize(
+    "obj, tojson_args", [
+        ({"b": "<script>", "a": "&'>"}, ""),
+        ({1: "a", 2: ["b"]}, ""),
+        ({"big": 2 ** 70}, ""),
+        ({"b": [1, {"x": None}], "a": 1}, "indent=2"),
+        ({"a": 1}, "indent=4"),
+    ]
+)
+def test_jinja_json_dumps(obj, tojson_args):
+    # rendering tojson with orjson matches jinja's default policy
+    template = "{{ obj|tojson(%s) }}" % tojson_args
+    default_env = Environment()
+    orjson_env = Environment()
+    orjson_env.policies["json.dumps_function"] = app_module._jinja_json_dumps
+
+    expected = default_env.from_string(template).render(obj=obj)
+    rendered = orjson_env.from_string(template).render(obj=obj)
+    assert json.loads(rendered) == json.loads(expected)
+    if tojson_args:
+        assert rendered == expected
+    assert "<" not in rendered
+    assert ">" not in rendered
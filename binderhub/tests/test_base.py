@@ -0,0 +1,31 @@
+"""Test base handler"""
+
+import sys
+
+import pytest
+from tornado.web import HTTPError
+
+from binderhub.base import BaseHandler
+
+
+def _exc_info(exception):
+    try:
+        raise exception
+    except Exception:
+        return sys.exc_info()
+
+
+@pytest.mark.parametrize(
+    "exception, message", [
+        # not an HTTPError, no log_message
+        (ValueError("not shown"), ""),
+        (HTTPError(404), ""),
+        (HTTPError(404, "No provider found for prefix %s", "xx"), "No provider found for prefix xx"),
+        # stray % in a message that isn't a format string is shown as-is
+        (HTTPError(400, "Invalid spec owner%2Frepo/ref"), "Invalid spec owner%2Frepo/ref"),
+        (HTTPError(400, "100% invalid"), "100% invalid"),
+    ]
+)
+def test_extract_message(exception, message):
+    handler = BaseHandler.__new__(BaseHandler)
+    assert handler.extract_message(_exc_info(exception)) == message
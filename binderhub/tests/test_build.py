@@ -169,3 +169,36 @@ def test_git_credentials_passed_to_podspec_upon_submit():
     }
 
     assert env['GIT_CREDENTIAL_ENV'] == git_credentials
+
+
+def test_stream_logs():
+    lines = [
+        b'{"phase": "building", "message": "Step 1/10\\n"}\n',
+        b'not json\n',
+        b'\xff\xfe not utf8\n',
+    ]
+    mock_k8s_api = mock.MagicMock()
+    mock_k8s_api.read_namespaced_pod_log.return_value = iter(lines)
+
+    build = Build(
+        mock.MagicMock(), api=mock_k8s_api, name='test_build',
+        namespace='build_namespace', repo_url=mock.MagicMock(),
+        ref=mock.MagicMock(), build_image=mock.MagicMock(),
+        image_name=mock.MagicMock(), push_secret=mock.MagicMock(),
+        memory_limit=mock.MagicMock(), git_credentials=None,
+        docker_host='http://mydockerregistry.local',
+        node_selector=mock.MagicMock())
+
+    with mock.patch.object(build, 'progress') as progress:
+        build.stream_logs()
+
+    assert [call[0][0] for call in progress.call_args_list] == ['log'] * 3
+    payloads = [call[0][1] for call in progress.call_args_list]
+    for payload in payloads:
+        assert isinstance(payload, bytes)
+    # valid lines are passed through as-is
+    assert payloads[0] == lines[0]
+    assert json.loads(payloads[0]) == {"phase": "building", "message": "Step 1/10\n"}
+    # other lines are wrapped in a JSON event with unknown phase
+    assert json.loads(payloads[1]) == {"phase": "unknown", "message": "not json\n"}
+    assert json.loads(payloads[2]) == {"phase": "unknown", "message": "�� not utf8\n"}
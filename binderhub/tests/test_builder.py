@@ -1,6 +1,19 @@
+import asyncio
+import json
+from unittest import mock
+
 import pytest
+from tornado.concurrent import Future
+from tornado.iostream import StreamClosedError
+from tornado.web import Finish
 
-from binderhub.builder import _generate_build_name, _get_image_basename_and_tag
+from binderhub.builder import (
+    BuildHandler,
+    _ERROR_FRAMES,
+    _error_frame,
+    _generate_build_name,
+    _get_image_basename_and_tag,
+)
 
 
 @pytest.mark.parametrize("fullname,basename,tag", [
@@ -33,3 +46,128 @@ def test_build_name(build_slug, ref):
 
     last_char = build_name[-1]
     assert last_char not in ("-", "_", ".")
+
+
+@pytest.mark.parametrize('status_code,message,expected_message', [
+    (404, '', 'Not Found\n'),
+    (500, '', 'Internal Server Error\n'),
+    (599, '', 'Unknown HTTP Error\n'),
+    (404, 'No such repo', 'No such repo\n'),
+])
+def test_error_frame(status_code, message, expected_message):
+    frame = _error_frame(status_code, message)
+    assert frame.startswith(b"data: ")
+    assert frame.endswith(b"\n\n")
+    assert json.loads(frame[len(b"data: "):]) == {
+        'phase': 'failed',
+        'status_code': status_code,
+        'message': expected_message,
+    }
+    if not message and status_code in _ERROR_FRAMES:
+        assert _ERROR_FRAMES[status_code] == frame
+
+
+class FakeEventStreamHandler(BuildHandler):
+    """BuildHandler with write/flush recorded instead of sent to a connection"""
+
+    def __init__(self):
+        self._finished = False
+        self.request = mock.Mock(uri="/build/gh/owner/repo/ref")
+        self.written = []
+        # futures returned by flush(), resolved by the test
+        self.flushes = []
+
+    def write(self, chunk):
+        self.written.append(chunk)
+
+    def flush(self):
+        f = Future()
+        self.flushes.append(f)
+        return f
+
+
+async def run_event_loop():
+    """Let scheduled callbacks run"""
+    for i in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_emit_coalesces_flushes():
+    handler = FakeEventStreamHandler()
+    for i in range(3):
+        await handler.emit({"n": i})
+    # nothing flushed until the event loop runs
+    assert handler.flushes == []
+    await run_event_loop()
+    # one flush for the burst of events
+    assert len(handler.flushes) == 1
+    assert [
+        json.loads(frame[len(b"data: "):]) for frame in handler.written
+    ] == [{"n": 0}, {"n": 1}, {"n": 2}]
+
+
+async def test_emit_waits_for_flush():
+    handler = FakeEventStreamHandler()
+    await handler.emit("first")
+    await run_event_loop()
+    assert len(handler.flushes) == 1
+
+    # the next emit waits for the flush in progress
+    emit = asyncio.ensure_future(handler.emit("second"))
+    await run_event_loop()
+    assert not emit.done()
+    assert handler.written == [b"data: first\n\n"]
+
+    handler.flushes[0].set_result(None)
+    await emit
+    assert handler.written == [b"data: first\n\n", b"data: second\n\n"]
+    await run_event_loop()
+    assert len(handler.flushes) == 2
+
+
+async def test_keepalive_skipped_while_flushing():
+    handler = FakeEventStreamHandler()
+    with mock.patch.object(handler, "keep_alive") as keep_alive:
+        # flush scheduled, not yet started
+        await handler.emit("first")
+        await handler._send_keepalive()
+        assert handler.written == [b"data: first\n\n"]
+        assert keep_alive.call_count == 1
+
+        # flush in progress
+        await run_event_loop()
+        assert len(handler.flushes) == 1
+        await handler._send_keepalive()
+        assert handler.written == [b"data: first\n\n"]
+        assert len(handler.flushes) == 1
+        assert keep_alive.call_count == 2
+
+        handler.flushes[0].set_result(None)
+        await run_event_loop()
+        # idle, send the keepalive
+        keepalive = asyncio.ensure_future(handler._send_keepalive())
+        await run_event_loop()
+        assert handler.written[-1] == b":keepalive\n\n"
+        assert len(handler.flushes) == 2
+
+        # emit waits for the keepalive flush
+        emit = asyncio.ensure_future(handler.emit("second"))
+        await run_event_loop()
+        assert not emit.done()
+        handler.flushes[1].set_result(None)
+        await keepalive
+        await emit
+        assert keep_alive.call_count == 3
+        await run_event_loop()
+        assert handler.written[-1] == b"data: second\n\n"
+        assert len(handler.flushes) == 3
+
+
+async def test_emit_stream_closed():
+    handler = FakeEventStreamHandler()
+    await handler.emit("first")
+    await run_event_loop()
+    handler.flushes[0].set_exception(StreamClosedError())
+    with pytest.raises(Finish):
+        await handler.emit("second")
+    assert handler.written == [b"data: first\n\n"]
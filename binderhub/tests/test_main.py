@@ -1,6 +1,7 @@
 """Test main handlers"""
 
 import time
+from unittest import mock
 from urllib.parse import quote
 from urllib.parse import urlparse
 
@@ -10,6 +11,7 @@ from bs4 import BeautifulSoup
 
 from binderhub import __version__ as binder_version
 
+from .conftest import skip_remote
 from .utils import async_requests
 
 
@@ -86,6 +88,36 @@ async def test_about_handler(app):
     assert binder_version.split("+")[0] in r.text
 
 
+async def test_custom_404(app):
+    responses = []
+    for i in range(2):
+        responses.append(await async_requests.get(app.url + "/no/such/page"))
+    for r in responses:
+        assert r.status_code == 404
+        assert "404: Not Found" in r.text
+    assert responses[0].text == responses[1].text
+
+
+@skip_remote
+async def test_custom_404_cached(app):
+    # without template auto-reload, the 404 page is rendered once, then reused
+    jinja_env = app.tornado_app.settings["jinja2_env"]
+    rendered_pages = {}
+    with mock.patch.object(jinja_env, "auto_reload", False), mock.patch.dict(
+        app.tornado_app.settings, {"rendered_error_pages": rendered_pages}
+    ):
+        r = await async_requests.get(app.url + "/no/such/page")
+        assert r.status_code == 404
+        assert rendered_pages[404] == r.text
+
+        with mock.patch.object(
+            jinja_env, "get_template", side_effect=RuntimeError("rendered again")
+        ):
+            r = await async_requests.get(app.url + "/no/such/page")
+        assert r.status_code == 404
+        assert r.text == rendered_pages[404]
+
+
 @pytest.mark.remote
 async def test_versions_handler(app):
     # Check that the about page loads
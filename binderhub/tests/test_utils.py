@@ -1,4 +1,5 @@
 import ipaddress
+import json
 from unittest import mock
 
 import pytest
@@ -64,6 +65,18 @@ def test_rendezvous_redistribution():
     assert abs(start_in["b1"] - start_in["b2"]) < 30
 
 
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_dumps(use_orjson):
+    if use_orjson and utils.orjson is None:
+        pytest.skip("orjson not installed")
+    orjson = utils.orjson if use_orjson else None
+    obj = {"phase": "failed", "message": "ünicode\n", "n": [1, 2], "obj": ipaddress.ip_address("10.0.0.1")}
+    with mock.patch.object(utils, "orjson", orjson):
+        serialized = utils.json_dumps(obj)
+    assert isinstance(serialized, bytes)
+    assert json.loads(serialized) == dict(obj, obj="10.0.0.1")
+
+
 def test_cache():
     cache = utils.Cache(max_size=2)
     cache.set('a', 1)
@@ -2,8 +2,14 @@
 from collections import OrderedDict
 from hashlib import blake2b
 import ipaddress
+import json
 import time
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from traitlets import Integer, TraitError
 
 
@@ -23,6 +29,17 @@ def blake2b_hash_as_int(b):
     return int.from_bytes(blake2b(b, digest_size=8).digest(), "big")
 
 
+def json_dumps(obj):
+    """Serialize `obj` to JSON, returned as utf8-encoded bytes.
+
+    Uses orjson if it is installed, falling back on the standard library.
+    Objects that are not JSON serializable are serialized with `str()`.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=str)
+    return json.dumps(obj, default=str).encode("utf8")
+
+
 def rendezvous_rank(buckets, key):
     """Rank the buckets for a given key using Rendez-vous hashing
 
@@ -50,4 +50,9 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     install_requires=requirements,
+    extras_require={
+        # orjson speeds up serialization of build events,
+        # but is only available for CPython
+        'orjson': ["orjson; platform_python_implementation == 'CPython'"],
+    },
 )